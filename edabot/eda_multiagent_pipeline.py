@@ -1,73 +1,146 @@
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pv
 import os
+import gc
+import multiprocessing
 import json
-import matplotlib.pyplot as plt
-import seaborn as sns
 from langgraph.graph import StateGraph, END
-from pydantic import BaseModel, Field, ConfigDict
+from dataclasses import dataclass, field
 from typing import Dict, Any, List, Optional, Callable
-import statsmodels.api as sm
 from openai import OpenAI
 import re
-from scipy.fft import fft, fftfreq
+from scipy.signal import welch
+from concurrent.futures import ProcessPoolExecutor
 
 
 # Ensure static directory exists for saving plots
 os.makedirs("static", exist_ok=True)
 
+# Column names that suggest the column holds dates
+_DATE_RX = re.compile(r"\b(?:date|published|issued|on|created|timestamp|time|day|month|hour)\b")
+
+# Share of a column's variance a single Welch frequency bin must hold for the
+# column to be flagged as cyclical (a pure sine lands around 0.5-0.7)
+_CYCLICAL_PEAK_SHARE = 0.25
+
 ### 1. Define State Model ###
-class EDAState(BaseModel):
+@dataclass(slots=True)
+class EDAState:
     """State for the EDA pipeline."""
-    model_config = ConfigDict(arbitrary_types_allowed=True)
 
-    data: Any = Field(description="The dataframe to analyze")
-    validation: Dict[str, Any] = Field(default_factory=dict)
-    info: Dict[str, Any] = Field(default_factory=dict)
-    summary: Dict[str, Any] = Field(default_factory=dict)
-    anomalies: Dict[str, Any] = Field(default_factory=dict)
-    visualizations: Dict[str, Any] = Field(default_factory=dict)
-    report: Dict[str, Any] = Field(default_factory=dict)
-    narrative: str = Field(default="")
+    data: Any  # The dataframe to analyze
+    validation: Dict[str, Any] = field(default_factory=dict)
+    info: Dict[str, Any] = field(default_factory=dict)
+    summary: Dict[str, Any] = field(default_factory=dict)
+    anomalies: Dict[str, Any] = field(default_factory=dict)
+    numeric_columns: List[str] = field(default_factory=list)
+    numeric_view: Any = None
+    numeric_array: Any = None
+    numeric_stats: Dict[str, Any] = field(default_factory=dict)
+    visualizations: Dict[str, Any] = field(default_factory=dict)
+    report: Dict[str, Any] = field(default_factory=dict)
+    narrative: str = ""
 
 
 ### 2. Define Functions for Each Node ###
+def compute_all_numeric_stats(arr: np.ndarray, columns: List[str]) -> Dict[str, Any]:
+    """Computes every per-column numeric statistic in a single sweep.
+
+    `arr` is the numeric block as a column-major float64 array. Returns the
+    describe()-style summary, the IQR outlier counts and the raw per-column
+    count/std/min/max arrays so the nodes downstream don't rescan the data.
+    """
+    arr = np.asarray(arr, dtype=np.float64)
+    if arr.shape[1] == 0:
+        empty = np.zeros(0)
+        return {"summary": {}, "outliers": np.zeros(0, dtype=np.int64),
+                "count": empty, "std": empty, "min": empty, "max": empty}
+
+    counts = (~np.isnan(arr)).sum(axis=0)
+    means = np.nanmean(arr, axis=0)
+    stds = np.nanstd(arr, axis=0, ddof=1)
+    mins = np.nanmin(arr, axis=0)
+    maxs = np.nanmax(arr, axis=0)
+    # All three quartiles of every column in one batched call
+    q25, q50, q75 = np.nanquantile(arr, [0.25, 0.5, 0.75], axis=0)
+
+    summary = {
+        col: {
+            "count": counts[i].item(), "mean": means[i].item(), "std": stds[i].item(),
+            "min": mins[i].item(), "25%": q25[i].item(), "50%": q50[i].item(),
+            "75%": q75[i].item(), "max": maxs[i].item(),
+        }
+        for i, col in enumerate(columns)
+    }
+
+    # IQR outliers with a single mask over the whole block
+    IQR = q75 - q25
+    lower = q25 - 1.5 * IQR
+    upper = q75 + 1.5 * IQR
+    outliers = ((arr < lower) | (arr > upper)).sum(axis=0)
+
+    return {"summary": summary, "outliers": outliers,
+            "count": counts, "std": stds, "min": mins, "max": maxs}
+
+def precompute_numeric(state: EDAState) -> EDAState:
+    """Selects the numeric columns once and caches their statistics."""
+    df = state.data
+    state.numeric_columns = df.select_dtypes(include="number").columns.tolist()
+    state.numeric_view = df[state.numeric_columns]
+    # Contiguous float64 copy, column-major so every per-column scan is stride-1.
+    # float32 would round large values and collapse their quartiles.
+    state.numeric_array = np.asfortranarray(state.numeric_view.to_numpy(dtype=np.float64, na_value=np.nan))
+    state.numeric_stats = compute_all_numeric_stats(state.numeric_array, state.numeric_columns)
+    return state
+
 def validate_data(state: EDAState) -> EDAState:
     """Checks for missing values and duplicate rows."""
     df = state.data
-    date_column_patterns = ["date", "published", "issued", "on", "created", "timestamp", "time", "day", "month", "hour"]
-    suspicious_date_columns = []
-
-    for col in df.columns:
-        col_lower = col.lower()
-        if any(re.search(rf"\b{pattern}\b", col_lower) for pattern in date_column_patterns):
-            if not np.issubdtype(df[col].dtype, np.datetime64):
-                suspicious_date_columns.append(col)
-
-    def detect_cyclical_numeric_with_fft(df: pd.DataFrame) -> list:
-        cyclical_cols = []
-
-        for col in df.columns:
-            if pd.api.types.is_numeric_dtype(df[col]):
-                # Apply Fourier transform
-                data = df[col].dropna().values
-                N = len(data)
-                T = 1.0  # Assume uniform spacing between data points (could be adjusted)
-                x = np.linspace(0.0, N*T, N, endpoint=False)
-                yf = fft(data)
-                xf = fftfreq(N, T)[:N//2]
-                amplitude = 2.0/N * np.abs(yf[:N//2])
-
-                # Look for peaks in frequency that might indicate cycles
-                if np.max(amplitude) > 0.8:  # Set threshold for significant peak
-                    cyclical_cols.append(col)
-
-        return cyclical_cols
-    cyclical_cols = detect_cyclical_numeric_with_fft(df)
+    cols_lower = df.columns.astype(str).str.lower()
+    mask = np.asarray(cols_lower.str.contains(_DATE_RX, regex=True), dtype=bool)
+    non_dt = ~df.dtypes.map(pd.api.types.is_datetime64_any_dtype).to_numpy(dtype=bool)
+    suspicious_date_columns = df.columns[mask & non_dt].tolist()
+
+    def detect_cyclical_numeric_with_fft(arr: np.ndarray, columns: list, stats: Dict[str, Any]) -> list:
+        if arr.shape[0] == 0 or arr.shape[1] == 0:
+            return []
+
+        # Skip columns whose spectrum is meaningless: too few samples,
+        # (near-)constant values or running integer IDs
+        is_id = np.all(np.diff(arr, axis=0) == 1, axis=0)
+        keep = (
+            (stats["count"] >= 32)
+            & (stats["max"] > stats["min"])
+            & (stats["std"] >= 1e-12)
+            & ~is_id
+        )
+        if not keep.any():
+            return []
+        arr = arr[:, keep]
+        columns = [col for col, kept in zip(columns, keep) if kept]
+        N = arr.shape[0]
+
+        # Centre every column and fill gaps with its mean so the whole block
+        # goes through a single batched transform
+        arr = np.nan_to_num(arr - np.nanmean(arr, axis=0))
+
+        # Welch averages fixed-size FFT segments, so the cost grows linearly with N
+        nperseg = min(256, N)
+        freqs, power = welch(arr, nperseg=nperseg, axis=0)
+
+        # Look for a frequency bin holding a large share of the column's variance
+        peak_share = power.max(axis=0) * (freqs[1] - freqs[0]) / arr.var(axis=0)
+        return [col for col, share in zip(columns, peak_share) if share > _CYCLICAL_PEAK_SHARE]
+    cyclical_cols = detect_cyclical_numeric_with_fft(state.numeric_array, state.numeric_columns, state.numeric_stats)
+
+    # Plain NumPy reductions, no intermediate Series
+    na_counts = df.isna().to_numpy().sum(axis=0)
 
     state.validation = {
-        "missingValues": df.isnull().sum().to_dict(),
-        "duplicateRows": df.duplicated().sum(),
+        "missingValues": dict(zip(df.columns.tolist(), na_counts.tolist())),
+        "duplicateRows": int(df.duplicated().to_numpy().sum()),
         "suspiciousDate": suspicious_date_columns,
         "suspectedCyclical": cyclical_cols
 
@@ -87,87 +160,139 @@ def summary_info(state: EDAState) -> EDAState:
     return state
 def generate_summary(state: EDAState) -> EDAState:
     """Computes basic descriptive statistics."""
-    df = state.data
-    state.summary = df.describe().to_dict()
+    state.summary = state.numeric_stats["summary"]
+    if not state.summary:
+        # No numeric columns, so describe the remaining ones instead
+        state.summary = state.data.describe().to_dict()
     return state
 
-def create_visualizations(state: EDAState) -> EDAState:
-    """Creates visualizations and saves them as images."""
-    df = state.data
-    num_cols = df.select_dtypes(include=["number"]).columns
-    plot_paths = {}
+# Standalone images cropped out of each column's combined figure
+_PANEL_SUFFIXES = ("hist", "boxplot", "qqplot")
 
-    # Ensure static directory exists
-    os.makedirs("static", exist_ok=True)
-
-    # Generate histograms
-    for col in num_cols:
-
-        fig, ax = plt.subplots(1,3, figsize=(15,5))
-        ax[0].set_title(f"Distribution of the {col}")
-        sns.histplot(data = df, x = f"{col}", kde = True, ax = ax[0])
+def _pyplot():
+    """Imports pyplot with the Agg backend and fast-render settings.
 
-        ax[1].set_title(f"Boxplot of the {col}")
-        sns.boxplot(data = df, x = f"{col}",  ax = ax[1])
-
-        ax[2].set_title(f"Gaussianity of thet  {col}")
-        sm.qqplot(df[f'{col}'], line = 's', ax = ax[2])
+    Plotting libraries are only loaded once visualizations are drawn, which
+    keeps them out of the API worker's start-up.
+    """
+    import matplotlib
+    matplotlib.use("Agg")  # Non-interactive backend, safe to use from forked workers
+    matplotlib.rcParams.update({
+        "savefig.dpi": 80,
+        "path.simplify": True,
+        "path.simplify_threshold": 1.0,
+        "agg.path.chunksize": 10000,
+        "figure.max_open_warning": 0,
+    })
+    import matplotlib.pyplot as plt
+    return plt
+
+def _render_column_plots(col, series_values, out_dir):
+    """Renders every plot for a single numeric column and returns their paths.
+
+    Lives at module level and takes a plain NumPy array so it can be shipped
+    cheaply to a worker process.
+    """
+    plt = _pyplot()
+    import statsmodels.api as sm
+    from PIL import Image
 
-        fig.suptitle(f"Distribution of {col}")
-        plot_path = f"static/{col}_plots.png"
-        plt.savefig(plot_path)
-        plt.close()
-        plot_paths[f"{col}"] = plot_path
+    plot_paths = {}
+    values = np.asarray(series_values)
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return plot_paths
+
+    # Reuse one figure per process instead of allocating a new one per column
+    fig = plt.figure(num="column_plots", figsize=(15,5), dpi=80)
+    fig.clf()
+    ax = fig.subplots(1,3)
+    ax[0].set_title(f"Distribution of the {col}")
+    ax[0].hist(values, bins=20)
+    ax[0].set_xlabel(col)
+
+    ax[1].set_title(f"Boxplot of the {col}")
+    ax[1].boxplot(values, vert=False)
+    ax[1].set_xlabel(col)
+
+    ax[2].set_title(f"Gaussianity of thet  {col}")
+    sm.qqplot(values, line = 's', ax = ax[2])
+
+    fig.suptitle(f"Distribution of {col}")
+
+    # Render once, then cut the individual panels out of the same bitmap
+    fig.canvas.draw()
+    renderer = fig.canvas.get_renderer()
+    pixels = np.asarray(fig.canvas.buffer_rgba())
+    height, width = pixels.shape[:2]
+    img = Image.fromarray(pixels[..., :3])
+
+    plot_path = f"{out_dir}/{col}_plots.png"
+    img.save(plot_path, "PNG", compress_level=1)
+    plot_paths[f"{col}"] = plot_path
+
+    for axis, suffix in zip(ax, _PANEL_SUFFIXES):
+        bbox = axis.get_tightbbox(renderer)
+        box = (
+            max(int(bbox.x0), 0),
+            max(int(height - bbox.y1), 0),
+            min(int(np.ceil(bbox.x1)), width),
+            min(int(np.ceil(height - bbox.y0)), height),
+        )
+        panel_path = f"{out_dir}/{col}_{suffix}.png"
+        img.crop(box).save(panel_path, "PNG", compress_level=1)
+        plot_paths[f"{col}_{suffix}"] = panel_path
 
-        plt.figure(figsize=(10, 6))
-        sns.histplot(df[col], bins=20, kde=True)
-        plt.title(f"Histogram of {col}")
-        plt.savefig(f"static/{col}_hist.png")
-        plt.close()
-        plot_paths[f"{col}_hist"] = f"static/{col}_hist.png"
+    return plot_paths
 
-        plt.figure(figsize=(10, 6))
-        sns.boxplot(data=df, x=col)
-        plt.title(f"Boxplot of {col}")
-        plt.savefig(f"static/{col}_boxplot.png")
-        plt.close()
-        plot_paths[f"{col}_boxplot"] = f"static/{col}_boxplot.png"
+def create_visualizations(state: EDAState) -> Dict[str, Any]:
+    """Creates visualizations and saves them as images."""
+    plt = _pyplot()
+    import seaborn as sns
 
-        plt.figure(figsize=(10, 6))
-        sm.qqplot(df[col], line='s')
-        plt.title(f"QQ Plot of {col}")
-        plt.savefig(f"static/{col}_qqplot.png")
-        plt.close()
-        plot_paths[f"{col}_qqplot"] = f"static/{col}_qqplot.png"
+    num = state.numeric_view
+    num_cols = state.numeric_columns
+    arr = state.numeric_array
+    plot_paths = {}
 
+    # Ensure static directory exists
+    os.makedirs("static", exist_ok=True)
 
+    # Render the per-column plots in parallel, one column per task
+    args = [(c, np.ascontiguousarray(arr[:, i]), "static") for i, c in enumerate(num_cols)]
+    if args:
+        # Never start more workers than columns, and don't fork this
+        # (multi-threaded) process directly. The long-lived fork server
+        # preloads the plotting stack once, so every worker inherits it.
+        mp_context = multiprocessing.get_context("forkserver")
+        mp_context.set_forkserver_preload([__name__, "matplotlib.pyplot", "statsmodels.api", "PIL.Image"])
+        with ProcessPoolExecutor(
+            max_workers=min(len(args), os.cpu_count() or 1),
+            mp_context=mp_context,
+        ) as executor:
+            for column_paths in executor.map(_render_column_plots, *zip(*args)):
+                plot_paths.update(column_paths)
 
     # Generate correlation heatmap
     if len(num_cols) > 1:  # Only create heatmap if multiple numeric columns exist
-        plt.figure(figsize=(10, 6))
-        sns.heatmap(df[num_cols].corr(), annot=True, cmap="coolwarm", fmt=".2f")
-        plt.title("Correlation Heatmap")
+        # Explicit figure: concurrent uploads share pyplot's global state
+        fig, ax = plt.subplots(figsize=(10, 6))
+        sns.heatmap(num.corr(), annot=True, cmap="coolwarm", fmt=".2f", ax=ax)
+        ax.set_title("Correlation Heatmap")
         heatmap_path = "static/correlation_heatmap.png"
-        plt.savefig(heatmap_path)
-        plt.close()
+        fig.savefig(heatmap_path, dpi=80, pil_kwargs={"compress_level": 1})
+        plt.close(fig)
         plot_paths["correlation_heatmap"] = heatmap_path
 
-    state.visualizations = plot_paths
-    return state
+    # Free the closed figure's canvas and fonts right away
+    gc.collect()
+
+    # Only return this node's field, it runs in parallel with generate_narrative
+    return {"visualizations": plot_paths}
 
 def detect_anomalies(state: EDAState) -> EDAState:
     """Detects outliers using IQR method."""
-    df = state.data
-    anomalies = {}
-
-    for col in df.select_dtypes(include=["number"]).columns:
-        Q1 = df[col].quantile(0.25)
-        Q3 = df[col].quantile(0.75)
-        IQR = Q3 - Q1
-        outliers = df[(df[col] < (Q1 - 1.5 * IQR)) | (df[col] > (Q3 + 1.5 * IQR))]
-        anomalies[col] = len(outliers)
-
-    state.anomalies = anomalies
+    state.anomalies = dict(zip(state.numeric_columns, state.numeric_stats["outliers"].tolist()))
     return state
 
 def generate_report(state: EDAState) -> EDAState:
@@ -183,7 +308,7 @@ def generate_report(state: EDAState) -> EDAState:
     state.report = report
     return state
 
-def generate_narrative(state: EDAState) -> EDAState:
+def generate_narrative(state: EDAState) -> Dict[str, Any]:
     """
     Uses an LLM  to generate a narrative explanation based on EDA results.
     """
@@ -226,8 +351,8 @@ def generate_narrative(state: EDAState) -> EDAState:
         # In case of error, fall back to a basic explanation.
         narrative_text = f"An error occurred while generating narrative: {str(e)}"
 
-    state.narrative = narrative_text
-    return state
+    # Only return this node's field, it runs in parallel with create_visualizations
+    return {"narrative": narrative_text}
 
 ### 3. Build Multi-Agent Graph ###
 def build_graph():
@@ -236,6 +361,7 @@ def build_graph():
     # Build graph
     workflow = StateGraph(EDAState)
 
+    workflow.add_node("precompute_numeric", precompute_numeric)
     workflow.add_node("validate_data", validate_data)
     workflow.add_node("generate_summary", generate_summary)
     workflow.add_node("create_visualizations", create_visualizations)
@@ -246,28 +372,47 @@ def build_graph():
 
 
     # Define edges
+    workflow.add_edge("precompute_numeric", "validate_data")
     workflow.add_edge("validate_data", "summary_info")
     workflow.add_edge("summary_info", "generate_summary")
-    workflow.add_edge("generate_summary", "create_visualizations")
-    workflow.add_edge("create_visualizations", "generate_anomalies")
+    workflow.add_edge("generate_summary", "generate_anomalies")
+    # Plot rendering (CPU) and the LLM call (network) run in the same step
+    workflow.add_edge("generate_anomalies", "create_visualizations")
     workflow.add_edge("generate_anomalies", "generate_narrative")
-    workflow.add_edge("generate_narrative", "generate_report")
+    workflow.add_edge(["create_visualizations", "generate_narrative"], "generate_report")
     workflow.add_edge("generate_report", END)
 
     # Add state updates
-    workflow.set_entry_point("validate_data")
+    workflow.set_entry_point("precompute_numeric")
 
     return workflow.compile()
 
 ### 4. Function to Run the Multi-Agent EDA ###
-def run_eda(file_path):
-    """Runs EDA using the multi-agent workflow."""
+def run_eda(source):
+    """Runs EDA using the multi-agent workflow.
+
+    `source` is either a file path or a file-like object with a `name`.
+    """
     try:
         # Load data directly into DataFrame
-        if file_path.endswith(".csv"):
-            df = pd.read_csv(file_path)
-        elif file_path.endswith(".json"):
-            df = pd.read_json(file_path)
+        name = getattr(source, "name", source)
+        if name.endswith(".csv"):
+            # Multithreaded arrow parser, handed to pandas without a second copy
+            try:
+                table = pv.read_csv(source, read_options=pv.ReadOptions(use_threads=True, block_size=8 << 20))
+                # Keep dates and times as text, like pd.read_csv does
+                for i, col_type in enumerate(table.schema.types):
+                    if pa.types.is_temporal(col_type):
+                        table = table.set_column(i, table.schema.names[i], table.column(i).cast(pa.string()))
+                df = table.to_pandas(types_mapper=pd.ArrowDtype, self_destruct=True)
+                del table
+            except pa.ArrowInvalid:
+                # Arrow rejects ragged rows that pandas pads with NaN
+                if hasattr(source, "seek"):
+                    source.seek(0)
+                df = pd.read_csv(source)
+        elif name.endswith(".json"):
+            df = pd.read_json(source)
         else:
             raise ValueError("Unsupported file format. Use CSV or JSON.")
 
@@ -0,0 +1,22 @@
+from fastapi.testclient import TestClient
+
+import edabot.eda_multiagent_pipeline as pipeline
+from api.fast import app
+
+
+def _no_llm(api_key=None):
+    raise RuntimeError("LLM disabled in tests")
+
+
+def test_upload_date_only_csv(monkeypatch):
+    """A CSV without numeric columns still yields a full, serializable report."""
+    monkeypatch.setattr(pipeline, "OpenAI", _no_llm)
+    client = TestClient(app)
+    csv = b"ts,name\n2024-01-01 10:00:00,a\n2024-01-02 11:00:00,b\n"
+
+    response = client.post("/upload/", files={"file": ("dates.csv", csv, "text/csv")})
+
+    assert response.status_code == 200
+    report = response.json()
+    assert set(report["Summary"]) == {"ts", "name"}
+    assert report["Summary"]["ts"]["top"] in ("2024-01-01 10:00:00", "2024-01-02 11:00:00")